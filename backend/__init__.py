@@ -0,0 +1 @@
+# Backend package initialization
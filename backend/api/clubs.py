@@ -6,63 +6,61 @@ CRUD operations for clubs with membership counts and announcements.
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends, Query
 
-from database.supabase_client import supabase
-from auth.google_oauth import get_current_user, require_admin
-from models.schemas import (
+from backend.database.supabase_client import supabase, run_query
+from backend.database.pool import get_pool, record_to_dict
+from backend.database.cache import cached, invalidate
+from backend.api.responses import orjson_response
+from backend.auth.google_oauth import get_current_user, require_admin
+from backend.models.schemas import (
     ClubCreate, ClubUpdate, ClubResponse,
     AnnouncementCreate, AnnouncementResponse,
-    MessageResponse
+    MessageResponse, BulkDeleteRequest
 )
 
 router = APIRouter(prefix="/clubs", tags=["Clubs"])
 
+# Club columns returned by the API (member_count is a trigger-maintained counter column)
+CLUB_SELECT = "id,name,description,logo_url,category,created_by,created_at,member_count"
+
 
 # ============================================================
 # Public Endpoints
 # ============================================================
 
 @router.get("", response_model=List[ClubResponse])
+@cached("clubs")
 async def get_clubs(
     search: Optional[str] = None,
-    limit: int = Query(default=50, le=100),
+    limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0)
 ):
     """
     Get all clubs with optional search filtering.
     Returns clubs sorted by creation date.
     """
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Database not configured")
+    conditions, params = [], []
+    if search:
+        params.append(f"%{search}%")
+        conditions.append(f"c.name ILIKE ${len(params)}")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params += [limit, offset]
     
-    query = supabase.table("clubs").select("*")
+    pool = await get_pool()
+    rows = await pool.fetch(f"""
+        SELECT c.id, c.name, c.description, c.logo_url, c.category, c.created_by, c.created_at,
+               c.member_count
+        FROM clubs c
+        {where}
+        ORDER BY c.created_at DESC
+        LIMIT ${len(params) - 1} OFFSET ${len(params)}
+    """, *params)
     
-    if search:
-        query = query.ilike("name", f"%{search}%")
-    
-    result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
-    
-    # Get member counts for each club
-    clubs = []
-    for club in result.data:
-        member_count = supabase.table("club_memberships").select(
-            "id", count="exact"
-        ).eq("club_id", club["id"]).execute()
-        
-        clubs.append(ClubResponse(
-            id=club["id"],
-            name=club["name"],
-            description=club.get("description"),
-            logo_url=club.get("logo_url"),
-            category=club.get("category"),
-            created_by=club.get("created_by"),
-            created_at=club.get("created_at"),
-            member_count=member_count.count or 0
-        ))
-    
-    return clubs
+    # Rows come straight from the database, so skip re-validating them
+    return [ClubResponse.model_construct(**record_to_dict(row)) for row in rows]
 
 
 @router.get("/{club_id}", response_model=ClubResponse)
+@cached("clubs")
 async def get_club(club_id: str):
     """
     Get a single club by ID with its member count.
@@ -70,27 +68,13 @@ async def get_club(club_id: str):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    result = supabase.table("clubs").select("*").eq("id", club_id).execute()
+    result = await run_query(supabase.table("clubs").select(CLUB_SELECT).eq("id", club_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Club not found")
     
     club = result.data[0]
-    
-    member_count = supabase.table("club_memberships").select(
-        "id", count="exact"
-    ).eq("club_id", club_id).execute()
-    
-    return ClubResponse(
-        id=club["id"],
-        name=club["name"],
-        description=club.get("description"),
-        logo_url=club.get("logo_url"),
-        category=club.get("category"),
-        created_by=club.get("created_by"),
-        created_at=club.get("created_at"),
-        member_count=member_count.count or 0
-    )
+    return ClubResponse.model_construct(**club)
 
 
 # ============================================================
@@ -105,9 +89,9 @@ async def get_club_announcements(club_id: str):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    result = supabase.table("club_announcements").select("*").eq(
-        "club_id", club_id
-    ).order("created_at", desc=True).execute()
+    result = await run_query(supabase.table("club_announcements").select(
+        "id,club_id,title,content,created_by,created_at"
+    ).eq("club_id", club_id).order("created_at", desc=True))
     
     return [AnnouncementResponse(**ann) for ann in result.data]
 
@@ -128,7 +112,7 @@ async def create_announcement(
     ann_data["club_id"] = club_id
     ann_data["created_by"] = current_user["id"]
     
-    result = supabase.table("club_announcements").insert(ann_data).execute()
+    result = await run_query(supabase.table("club_announcements").insert(ann_data))
     
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create announcement")
@@ -145,25 +129,29 @@ async def get_club_members(club_id: str):
     """
     Get all members of a specific club.
     """
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Database not configured")
-    
-    # Get membership records with user info
-    memberships = supabase.table("club_memberships").select("*").eq("club_id", club_id).execute()
+    # Get membership records joined with user info
+    pool = await get_pool()
+    rows = await pool.fetch("""
+        SELECT m.id AS membership_id, m.joined_at, u.id, u.name, u.email, u.avatar_url
+        FROM club_memberships m
+        JOIN users u ON u.id = m.user_id
+        WHERE m.club_id = $1
+    """, club_id)
     
     members = []
-    for membership in memberships.data:
-        user = supabase.table("users").select("id, name, email, avatar_url").eq(
-            "id", membership["user_id"]
-        ).execute()
-        if user.data:
-            members.append({
-                "membership_id": membership["id"],
-                "joined_at": membership["joined_at"],
-                "user": user.data[0]
-            })
+    for row in map(record_to_dict, rows):
+        members.append({
+            "membership_id": row["membership_id"],
+            "joined_at": row["joined_at"],
+            "user": {
+                "id": row["id"],
+                "name": row["name"],
+                "email": row["email"],
+                "avatar_url": row["avatar_url"]
+            }
+        })
     
-    return members
+    return orjson_response(members)
 
 
 # ============================================================
@@ -181,22 +169,14 @@ async def create_club(club: ClubCreate, current_user: dict = Depends(require_adm
     club_data = club.model_dump()
     club_data["created_by"] = current_user["id"]
     
-    result = supabase.table("clubs").insert(club_data).execute()
+    result = await run_query(supabase.table("clubs").insert(club_data))
     
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create club")
     
-    created = result.data[0]
-    return ClubResponse(
-        id=created["id"],
-        name=created["name"],
-        description=created.get("description"),
-        logo_url=created.get("logo_url"),
-        category=created.get("category"),
-        created_by=created.get("created_by"),
-        created_at=created.get("created_at"),
-        member_count=0
-    )
+    await invalidate("clubs")
+    
+    return ClubResponse.model_construct(**result.data[0])
 
 
 @router.put("/{club_id}", response_model=ClubResponse)
@@ -212,41 +192,49 @@ async def update_club(club_id: str, club: ClubUpdate, admin: dict = Depends(requ
     if not update_data:
         raise HTTPException(status_code=400, detail="No fields to update")
     
-    result = supabase.table("clubs").update(update_data).eq("id", club_id).execute()
+    result = await run_query(supabase.table("clubs").update(update_data).eq("id", club_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Club not found")
     
-    updated = result.data[0]
-    return ClubResponse(
-        id=updated["id"],
-        name=updated["name"],
-        description=updated.get("description"),
-        logo_url=updated.get("logo_url"),
-        category=updated.get("category"),
-        created_by=updated.get("created_by"),
-        created_at=updated.get("created_at"),
-        member_count=0
-    )
+    await invalidate("clubs")
+    
+    return ClubResponse.model_construct(**result.data[0])
 
 
 @router.delete("/{club_id}", response_model=MessageResponse)
 async def delete_club(club_id: str, admin: dict = Depends(require_admin)):
     """
     Delete a club. Requires admin access.
-    Also removes all associated memberships and announcements.
+    Memberships and announcements are removed by the ON DELETE CASCADE foreign keys.
     """
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    # Delete associated data first
-    supabase.table("club_memberships").delete().eq("club_id", club_id).execute()
-    supabase.table("club_announcements").delete().eq("club_id", club_id).execute()
-    
-    # Delete the club
-    result = supabase.table("clubs").delete().eq("id", club_id).execute()
+    result = await run_query(supabase.table("clubs").delete().eq("id", club_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Club not found")
     
+    await invalidate("clubs")
+    
     return MessageResponse(message="Club deleted successfully")
+
+
+@router.delete("", response_model=MessageResponse)
+async def delete_clubs(request: BulkDeleteRequest, admin: dict = Depends(require_admin)):
+    """
+    Delete several clubs in one request. Requires admin access.
+    Memberships and announcements are removed by the ON DELETE CASCADE foreign keys.
+    """
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+    
+    if not request.ids:
+        raise HTTPException(status_code=400, detail="No clubs to delete")
+    
+    result = await run_query(supabase.table("clubs").delete().in_("id", request.ids))
+    
+    await invalidate("clubs")
+    
+    return MessageResponse(message=f"{len(result.data)} clubs deleted successfully")
@@ -6,74 +6,72 @@ CRUD operations for college events with category filtering and registration coun
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Depends, Query
 
-from database.supabase_client import supabase
-from auth.google_oauth import get_current_user, require_admin
-from models.schemas import (
+from backend.database.supabase_client import supabase, run_query
+from backend.database.pool import get_pool, record_to_dict
+from backend.database.cache import cached, invalidate
+from backend.auth.google_oauth import get_current_user, require_admin
+from backend.models.schemas import (
     EventCreate, EventUpdate, EventResponse, 
-    MessageResponse, EventCategory, EventStatus
+    MessageResponse, EventCategory, EventStatus, BulkDeleteRequest
 )
 
 router = APIRouter(prefix="/events", tags=["Events"])
 
+# Event columns returned by the API (registration_count is a trigger-maintained counter column)
+EVENT_SELECT = (
+    "id,title,description,category,event_date,venue,poster_url,created_by,"
+    "status,max_participants,created_at,registration_count"
+)
+
 
 # ============================================================
 # Public Endpoints
 # ============================================================
 
 @router.get("", response_model=List[EventResponse])
+@cached("events")
 async def get_events(
     category: Optional[EventCategory] = None,
     status: Optional[EventStatus] = None,
     search: Optional[str] = None,
-    limit: int = Query(default=50, le=100),
+    limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0)
 ):
     """
     Get all events with optional filtering by category, status, and search term.
     Returns events sorted by date (newest first).
     """
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Database not configured")
-    
-    query = supabase.table("events").select("*")
-    
     # Apply filters
+    conditions, params = [], []
     if category:
-        query = query.eq("category", category.value)
+        params.append(category.value)
+        conditions.append(f"e.category = ${len(params)}")
     if status:
-        query = query.eq("status", status.value)
+        params.append(status.value)
+        conditions.append(f"e.status = ${len(params)}")
     if search:
-        query = query.ilike("title", f"%{search}%")
+        params.append(f"%{search}%")
+        conditions.append(f"e.title ILIKE ${len(params)}")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params += [limit, offset]
     
     # Execute query with pagination
-    result = query.order("event_date", desc=False).range(offset, offset + limit - 1).execute()
-    
-    # Get registration counts for each event
-    events = []
-    for event in result.data:
-        reg_count = supabase.table("event_registrations").select(
-            "id", count="exact"
-        ).eq("event_id", event["id"]).execute()
-        
-        events.append(EventResponse(
-            id=event["id"],
-            title=event["title"],
-            description=event.get("description"),
-            category=event["category"],
-            event_date=event["event_date"],
-            venue=event["venue"],
-            poster_url=event.get("poster_url"),
-            created_by=event.get("created_by"),
-            status=event.get("status", "upcoming"),
-            max_participants=event.get("max_participants"),
-            created_at=event.get("created_at"),
-            registration_count=reg_count.count or 0
-        ))
-    
-    return events
+    pool = await get_pool()
+    rows = await pool.fetch(f"""
+        SELECT e.id, e.title, e.description, e.category, e.event_date, e.venue, e.poster_url,
+               e.created_by, e.status, e.max_participants, e.created_at, e.registration_count
+        FROM events e
+        {where}
+        ORDER BY e.event_date ASC
+        LIMIT ${len(params) - 1} OFFSET ${len(params)}
+    """, *params)
+    
+    # Rows come straight from the database, so skip re-validating them
+    return [EventResponse.model_construct(**record_to_dict(row)) for row in rows]
 
 
 @router.get("/{event_id}", response_model=EventResponse)
+@cached("events")
 async def get_event(event_id: str):
     """
     Get a single event by ID with its registration count.
@@ -81,32 +79,13 @@ async def get_event(event_id: str):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    result = supabase.table("events").select("*").eq("id", event_id).execute()
+    result = await run_query(supabase.table("events").select(EVENT_SELECT).eq("id", event_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Event not found")
     
     event = result.data[0]
-    
-    # Get registration count
-    reg_count = supabase.table("event_registrations").select(
-        "id", count="exact"
-    ).eq("event_id", event_id).execute()
-    
-    return EventResponse(
-        id=event["id"],
-        title=event["title"],
-        description=event.get("description"),
-        category=event["category"],
-        event_date=event["event_date"],
-        venue=event["venue"],
-        poster_url=event.get("poster_url"),
-        created_by=event.get("created_by"),
-        status=event.get("status", "upcoming"),
-        max_participants=event.get("max_participants"),
-        created_at=event.get("created_at"),
-        registration_count=reg_count.count or 0
-    )
+    return EventResponse.model_construct(**event)
 
 
 # ============================================================
@@ -125,26 +104,14 @@ async def create_event(event: EventCreate, current_user: dict = Depends(require_
     event_data["created_by"] = current_user["id"]
     event_data["status"] = "upcoming"
     
-    result = supabase.table("events").insert(event_data).execute()
+    result = await run_query(supabase.table("events").insert(event_data))
     
     if not result.data:
         raise HTTPException(status_code=500, detail="Failed to create event")
     
-    created = result.data[0]
-    return EventResponse(
-        id=created["id"],
-        title=created["title"],
-        description=created.get("description"),
-        category=created["category"],
-        event_date=created["event_date"],
-        venue=created["venue"],
-        poster_url=created.get("poster_url"),
-        created_by=created.get("created_by"),
-        status=created.get("status", "upcoming"),
-        max_participants=created.get("max_participants"),
-        created_at=created.get("created_at"),
-        registration_count=0
-    )
+    await invalidate("events")
+    
+    return EventResponse.model_construct(**result.data[0])
 
 
 @router.put("/{event_id}", response_model=EventResponse)
@@ -167,44 +134,49 @@ async def update_event(event_id: str, event: EventUpdate, admin: dict = Depends(
     if "status" in update_data:
         update_data["status"] = update_data["status"].value if hasattr(update_data["status"], 'value') else update_data["status"]
     
-    result = supabase.table("events").update(update_data).eq("id", event_id).execute()
+    result = await run_query(supabase.table("events").update(update_data).eq("id", event_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    updated = result.data[0]
-    return EventResponse(
-        id=updated["id"],
-        title=updated["title"],
-        description=updated.get("description"),
-        category=updated["category"],
-        event_date=updated["event_date"],
-        venue=updated["venue"],
-        poster_url=updated.get("poster_url"),
-        created_by=updated.get("created_by"),
-        status=updated.get("status", "upcoming"),
-        max_participants=updated.get("max_participants"),
-        created_at=updated.get("created_at"),
-        registration_count=0
-    )
+    await invalidate("events")
+    
+    return EventResponse.model_construct(**result.data[0])
 
 
 @router.delete("/{event_id}", response_model=MessageResponse)
 async def delete_event(event_id: str, admin: dict = Depends(require_admin)):
     """
     Delete an event. Requires admin access.
-    Also removes all associated registrations.
+    Registrations are removed by the ON DELETE CASCADE foreign key.
     """
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    # Delete associated registrations first
-    supabase.table("event_registrations").delete().eq("event_id", event_id).execute()
-    
-    # Delete the event
-    result = supabase.table("events").delete().eq("id", event_id).execute()
+    result = await run_query(supabase.table("events").delete().eq("id", event_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Event not found")
     
+    await invalidate("events")
+    
     return MessageResponse(message="Event deleted successfully")
+
+
+@router.delete("", response_model=MessageResponse)
+async def delete_events(request: BulkDeleteRequest, admin: dict = Depends(require_admin)):
+    """
+    Delete several events in one request. Requires admin access.
+    Registrations are removed by the ON DELETE CASCADE foreign key.
+    """
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+    
+    if not request.ids:
+        raise HTTPException(status_code=400, detail="No events to delete")
+    
+    result = await run_query(supabase.table("events").delete().in_("id", request.ids))
+    
+    await invalidate("events")
+    
+    return MessageResponse(message=f"{len(result.data)} events deleted successfully")
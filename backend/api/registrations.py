@@ -3,14 +3,18 @@ Registration API Endpoints
 Event registration and club membership management.
 """
 
+import asyncio
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends
 
-from database.supabase_client import supabase
-from auth.google_oauth import get_current_user, require_admin
-from models.schemas import (
+from backend.database.supabase_client import supabase, run_query
+from backend.database.pool import get_pool, record_to_dict
+from backend.database.cache import invalidate
+from backend.api.responses import orjson_response
+from backend.auth.google_oauth import get_current_user, require_admin
+from backend.models.schemas import (
     EventRegistrationResponse, ClubMembershipResponse,
-    EventResponse, ClubResponse, MessageResponse, UserResponse
+    EventResponse, ClubResponse, MessageResponse, BulkDeleteRequest
 )
 
 router = APIRouter(prefix="/registrations", tags=["Registrations"])
@@ -29,34 +33,21 @@ async def register_for_event(event_id: str, current_user: dict = Depends(get_cur
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    # Check if event exists
-    event = supabase.table("events").select("*").eq("id", event_id).execute()
-    if not event.data:
-        raise HTTPException(status_code=404, detail="Event not found")
-    
-    # Check if already registered
-    existing = supabase.table("event_registrations").select("*").eq(
-        "user_id", current_user["id"]
-    ).eq("event_id", event_id).execute()
+    # Existence, duplicate and capacity checks plus the insert run atomically in Postgres
+    registered = await run_query(supabase.rpc("register_for_event", {
+        "p_event_id": event_id,
+        "p_user_id": current_user["id"]
+    }))
     
-    if existing.data:
+    if registered.data == "not_found":
+        raise HTTPException(status_code=404, detail="Event not found")
+    if registered.data == "already_registered":
         raise HTTPException(status_code=400, detail="Already registered for this event")
+    if registered.data != "ok":
+        raise HTTPException(status_code=400, detail="Event is full")
     
-    # Check max participants
-    event_data = event.data[0]
-    if event_data.get("max_participants"):
-        current_count = supabase.table("event_registrations").select(
-            "id", count="exact"
-        ).eq("event_id", event_id).execute()
-        
-        if current_count.count >= event_data["max_participants"]:
-            raise HTTPException(status_code=400, detail="Event is full")
-    
-    # Register user
-    supabase.table("event_registrations").insert({
-        "user_id": current_user["id"],
-        "event_id": event_id
-    }).execute()
+    # Cached event responses include registration counts
+    await invalidate("events")
     
     return MessageResponse(message="Successfully registered for event")
 
@@ -69,13 +60,16 @@ async def unregister_from_event(event_id: str, current_user: dict = Depends(get_
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    result = supabase.table("event_registrations").delete().eq(
+    result = await run_query(supabase.table("event_registrations").delete().eq(
         "user_id", current_user["id"]
-    ).eq("event_id", event_id).execute()
+    ).eq("event_id", event_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Registration not found")
     
+    # Cached event responses include registration counts
+    await invalidate("events")
+    
     return MessageResponse(message="Successfully unregistered from event")
 
 
@@ -85,31 +79,32 @@ async def get_my_event_registrations(current_user: dict = Depends(get_current_us
     Get all event registrations for the current user.
     Includes full event details for each registration.
     """
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Database not configured")
-    
-    registrations = supabase.table("event_registrations").select("*").eq(
-        "user_id", current_user["id"]
-    ).order("registered_at", desc=True).execute()
+    # Registrations joined with their event details
+    pool = await get_pool()
+    rows = await pool.fetch("""
+        SELECT r.id, r.user_id, r.event_id, r.registered_at,
+               e.title, e.description, e.category, e.event_date, e.venue, e.poster_url,
+               e.status, e.created_at, e.registration_count
+        FROM event_registrations r
+        JOIN events e ON e.id = r.event_id
+        WHERE r.user_id = $1
+        ORDER BY r.registered_at DESC
+    """, current_user["id"])
     
     result = []
-    for reg in registrations.data:
-        # Fetch event details
-        event = supabase.table("events").select("*").eq("id", reg["event_id"]).execute()
-        event_data = None
-        if event.data:
-            e = event.data[0]
-            event_data = EventResponse(
-                id=e["id"],
-                title=e["title"],
-                description=e.get("description"),
-                category=e["category"],
-                event_date=e["event_date"],
-                venue=e["venue"],
-                poster_url=e.get("poster_url"),
-                status=e.get("status", "upcoming"),
-                created_at=e.get("created_at")
-            )
+    for reg in map(record_to_dict, rows):
+        event_data = EventResponse(
+            id=reg["event_id"],
+            title=reg["title"],
+            description=reg.get("description"),
+            category=reg["category"],
+            event_date=reg["event_date"],
+            venue=reg["venue"],
+            poster_url=reg.get("poster_url"),
+            status=reg.get("status", "upcoming"),
+            created_at=reg.get("created_at"),
+            registration_count=reg["registration_count"]
+        )
         
         result.append(EventRegistrationResponse(
             id=reg["id"],
@@ -134,24 +129,28 @@ async def join_club(club_id: str, current_user: dict = Depends(get_current_user)
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    # Check if club exists
-    club = supabase.table("clubs").select("*").eq("id", club_id).execute()
+    # Check that the club exists and that the user is not a member yet (concurrently)
+    club, existing = await asyncio.gather(
+        run_query(supabase.table("clubs").select("id").eq("id", club_id).limit(1)),
+        run_query(supabase.table("club_memberships").select("id").eq(
+            "user_id", current_user["id"]
+        ).eq("club_id", club_id).limit(1))
+    )
+    
     if not club.data:
         raise HTTPException(status_code=404, detail="Club not found")
     
-    # Check if already a member
-    existing = supabase.table("club_memberships").select("*").eq(
-        "user_id", current_user["id"]
-    ).eq("club_id", club_id).execute()
-    
     if existing.data:
         raise HTTPException(status_code=400, detail="Already a member of this club")
     
     # Join club
-    supabase.table("club_memberships").insert({
+    await run_query(supabase.table("club_memberships").insert({
         "user_id": current_user["id"],
         "club_id": club_id
-    }).execute()
+    }))
+    
+    # Cached club responses include member counts
+    await invalidate("clubs")
     
     return MessageResponse(message="Successfully joined club")
 
@@ -164,13 +163,16 @@ async def leave_club(club_id: str, current_user: dict = Depends(get_current_user
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    result = supabase.table("club_memberships").delete().eq(
+    result = await run_query(supabase.table("club_memberships").delete().eq(
         "user_id", current_user["id"]
-    ).eq("club_id", club_id).execute()
+    ).eq("club_id", club_id))
     
     if not result.data:
         raise HTTPException(status_code=404, detail="Membership not found")
     
+    # Cached club responses include member counts
+    await invalidate("clubs")
+    
     return MessageResponse(message="Successfully left club")
 
 
@@ -183,25 +185,14 @@ async def get_my_club_memberships(current_user: dict = Depends(get_current_user)
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    memberships = supabase.table("club_memberships").select("*").eq(
-        "user_id", current_user["id"]
-    ).order("joined_at", desc=True).execute()
+    # Club details are embedded through the clubs foreign key
+    memberships = await run_query(supabase.table("club_memberships").select(
+        "id,user_id,club_id,joined_at,clubs(id,name,description,logo_url,category,created_at,member_count)"
+    ).eq("user_id", current_user["id"]).order("joined_at", desc=True))
     
     result = []
     for mem in memberships.data:
-        # Fetch club details
-        club = supabase.table("clubs").select("*").eq("id", mem["club_id"]).execute()
-        club_data = None
-        if club.data:
-            c = club.data[0]
-            club_data = ClubResponse(
-                id=c["id"],
-                name=c["name"],
-                description=c.get("description"),
-                logo_url=c.get("logo_url"),
-                category=c.get("category"),
-                created_at=c.get("created_at")
-            )
+        club_data = ClubResponse.model_construct(**mem["clubs"]) if mem.get("clubs") else None
         
         result.append(ClubMembershipResponse(
             id=mem["id"],
@@ -226,23 +217,21 @@ async def get_event_registrations(event_id: str, admin: dict = Depends(require_a
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    registrations = supabase.table("event_registrations").select("*").eq(
-        "event_id", event_id
-    ).execute()
+    # User info is embedded through the users foreign key
+    registrations = await run_query(supabase.table("event_registrations").select(
+        "id,registered_at,users(id,name,email,avatar_url)"
+    ).eq("event_id", event_id))
     
     users = []
     for reg in registrations.data:
-        user = supabase.table("users").select("id, name, email, avatar_url").eq(
-            "id", reg["user_id"]
-        ).execute()
-        if user.data:
+        if reg.get("users"):
             users.append({
                 "registration_id": reg["id"],
                 "registered_at": reg["registered_at"],
-                "user": user.data[0]
+                "user": reg["users"]
             })
     
-    return users
+    return orjson_response(users)
 
 
 @router.get("/admin/all-users")
@@ -253,13 +242,27 @@ async def get_all_users(admin: dict = Depends(require_admin)):
     if not supabase:
         raise HTTPException(status_code=500, detail="Database not configured")
     
-    result = supabase.table("users").select("*").order("created_at", desc=True).execute()
+    result = await run_query(supabase.table("users").select(
+        "id,email,name,avatar_url,role,created_at"
+    ).order("created_at", desc=True))
+    
+    return orjson_response(result.data)
+
+
+@router.delete("/admin/memberships", response_model=MessageResponse)
+async def delete_memberships(request: BulkDeleteRequest, admin: dict = Depends(require_admin)):
+    """
+    Remove several club memberships (by membership id) in one request. Requires admin access.
+    """
+    if not supabase:
+        raise HTTPException(status_code=500, detail="Database not configured")
+    
+    if not request.ids:
+        raise HTTPException(status_code=400, detail="No memberships to delete")
+    
+    result = await run_query(supabase.table("club_memberships").delete().in_("id", request.ids))
+    
+    # Cached club responses include member counts
+    await invalidate("clubs")
     
-    return [UserResponse(
-        id=u["id"],
-        email=u["email"],
-        name=u["name"],
-        avatar_url=u.get("avatar_url"),
-        role=u["role"],
-        created_at=u.get("created_at")
-    ) for u in result.data]
+    return MessageResponse(message=f"{len(result.data)} memberships removed successfully")
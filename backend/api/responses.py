@@ -0,0 +1,15 @@
+"""
+Response Helpers
+Fast JSON responses for endpoints that return plain dicts (no response_model).
+"""
+
+import orjson
+from fastapi import Response
+
+
+def orjson_response(content) -> Response:
+    """
+    Serializes already JSON-compatible data with orjson.
+    Skips FastAPI's jsonable_encoder pass, so only use it for plain dicts/lists from the database.
+    """
+    return Response(content=orjson.dumps(content), media_type="application/json")
@@ -3,26 +3,57 @@ Google OAuth Authentication Handler
 Handles Google ID token verification and JWT session management.
 """
 
-import os
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import hashlib
+import time
+from typing import List, Optional, Set
 
+import jwt
+import orjson
+import requests
+from cachecontrol import CacheControlAdapter
+from cachetools import TLRUCache
 from fastapi import APIRouter, HTTPException, Depends, Header
-from jose import jwt, JWTError
+from google.auth.exceptions import TransportError
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
-from dotenv import load_dotenv
 
-from database.supabase_client import supabase
-from models.schemas import GoogleLoginRequest, AuthResponse, UserResponse, MessageResponse
-
-load_dotenv()
+from backend.config import settings
+from backend.database.pool import get_pool, record_to_dict
+from backend.models.schemas import (
+    GoogleLoginRequest, AuthResponse, UserResponse, MessageResponse, MakeAdminRequest
+)
 
 # Configuration
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
-JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
+GOOGLE_CLIENT_ID = settings.google_client_id
+JWT_SECRET = settings.jwt_secret
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+# Claims get_current_user relies on — tokens issued before profile claims were added lack some of them
+JWT_REQUIRED_CLAIMS = ["sub", "email", "name", "role", "exp", "iat"]
+
+# HMAC key bytes, encoded once instead of on every sign/verify
+_JWT_KEY = JWT_SECRET.encode()
+# Reusable signer — payloads are encoded with orjson, so signing is one JSON dump plus the HMAC
+_JWT_SIGNER = jwt.PyJWS()
+
+# Shared transport for Google token verification — reuses one HTTPS connection pool across logins.
+# CacheControl honours the Cache-Control max-age Google sends with its signing certificates,
+# so steady-state verification is a local signature check instead of a certificate fetch.
+# The keep-alive pool matches the worker thread count, since verification runs in worker threads.
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+_GOOGLE_SESSION = requests.Session()
+_GOOGLE_SESSION.mount("https://", CacheControlAdapter(
+    pool_connections=4,
+    pool_maxsize=settings.worker_threads,
+    max_retries=0
+))
+_GOOGLE_REQUEST = google_requests.Request(session=_GOOGLE_SESSION)
+
+# Successful Google logins keyed by ID-token hash — SPAs replay the same ID token until it expires.
+# Entries live at most LOGIN_CACHE_TTL_SECONDS and never past the ID token's own exp.
+LOGIN_CACHE_TTL_SECONDS = 300
+_login_cache: TLRUCache = TLRUCache(maxsize=10_000, ttu=lambda _key, entry, now: now + entry[2])
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -36,19 +67,53 @@ def create_jwt_token(user_data: dict) -> str:
     Creates a JWT token with user data and expiration.
     
     Args:
-        user_data: Dictionary containing user information (id, email, role)
+        user_data: Dictionary containing user information (id, email, name, avatar_url, role, created_at)
     
     Returns:
         Encoded JWT token string
     """
+    now = int(time.time())
     payload = {
         "sub": user_data["id"],
         "email": user_data["email"],
+        "name": user_data.get("name", ""),
+        "avatar_url": user_data.get("avatar_url"),
         "role": user_data.get("role", "student"),
-        "exp": datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
-        "iat": datetime.utcnow()
+        "created_at": user_data.get("created_at"),
+        "exp": now + JWT_EXPIRATION_HOURS * 3600,
+        "iat": now
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return _JWT_SIGNER.encode(orjson.dumps(payload), _JWT_KEY, algorithm=JWT_ALGORITHM)
+
+
+def warm_up() -> None:
+    """
+    Prefetches Google's signing certificates into the session cache and exercises the
+    JWT signer once, so the first login after a cold start pays for neither.
+    Blocking — run it in a worker thread. A failed fetch is ignored, since
+    token verification fetches the certificates itself when they are missing.
+    """
+    try:
+        _GOOGLE_REQUEST(GOOGLE_CERTS_URL, method="GET", timeout=5)
+    except TransportError:
+        pass
+    _JWT_SIGNER.encode(b"{}", _JWT_KEY, algorithm=JWT_ALGORITHM)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hashes a bearer token so raw tokens are never kept in memory as cache keys."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def invalidate_user_cache(user_ids: Set[str]) -> None:
+    """
+    Drops cached logins for the given users, e.g. after their role changes, so their
+    next sign-in issues a token with the new role. The cache is scanned once, however
+    many users are passed.
+    """
+    for key, (cached_user_id, _, _) in list(_login_cache.items()):
+        if cached_user_id in user_ids:
+            _login_cache.pop(key, None)
 
 
 def verify_jwt_token(token: str) -> dict:
@@ -62,50 +127,47 @@ def verify_jwt_token(token: str) -> dict:
         Decoded token payload
     
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If token is invalid, expired or missing a required claim
     """
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(
+            token, _JWT_KEY, algorithms=[JWT_ALGORITHM],
+            options={"require": JWT_REQUIRED_CLAIMS}
+        )
         return payload
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
 
 async def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
     """
-    Dependency that extracts and verifies the current user from the Authorization header.
+    Dependency that authenticates the request from the JWT alone, without a database lookup.
+    The token carries the user's id, email, name, avatar_url and role as of their last login.
     
     Args:
         authorization: Bearer token from request header
     
     Returns:
-        User payload from JWT token
+        Decoded token claims, with the user id also exposed as "id"
     
     Raises:
-        HTTPException: If no token provided or token is invalid
+        HTTPException: If no token provided, or token is invalid or predates the profile claims
     """
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    token = authorization.split(" ")[1]
-    payload = verify_jwt_token(token)
-    
-    # Fetch user from database to ensure they still exist
-    if supabase:
-        result = supabase.table("users").select("*").eq("id", payload["sub"]).execute()
-        if not result.data:
-            raise HTTPException(status_code=401, detail="User not found")
-        return result.data[0]
-    
+    payload = verify_jwt_token(authorization.split(" ")[1])
+    payload["id"] = payload["sub"]
     return payload
 
 
 async def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
     """
     Dependency that ensures the current user has admin role.
+    Trusts the role claim signed into the JWT, so no database lookup is needed.
     
     Args:
-        current_user: Current authenticated user
+        current_user: Claims of the current authenticated user
     
     Returns:
         User data if admin
@@ -131,11 +193,17 @@ async def google_login(request: GoogleLoginRequest):
     2. Creates or updates user in database
     3. Returns JWT session token
     """
+    cache_key = _token_cache_key(request.token)
+    cached = _login_cache.get(cache_key)
+    if cached:
+        return cached[1]
+    
     try:
-        # Verify Google ID token
-        idinfo = id_token.verify_oauth2_token(
+        # Verify Google ID token (RSA check plus a possible certificate fetch, so off the event loop)
+        idinfo = await asyncio.to_thread(
+            id_token.verify_oauth2_token,
             request.token,
-            google_requests.Request(),
+            _GOOGLE_REQUEST,
             GOOGLE_CLIENT_ID
         )
 
@@ -145,37 +213,25 @@ async def google_login(request: GoogleLoginRequest):
         name = idinfo.get("name", "")
         avatar_url = idinfo.get("picture", "")
 
-        if not supabase:
-            raise HTTPException(status_code=500, detail="Database not configured")
-
-        # Check if user already exists
-        existing = supabase.table("users").select("*").eq("google_id", google_id).execute()
-
-        if existing.data:
-            # Update existing user info
-            user = existing.data[0]
-            supabase.table("users").update({
-                "name": name,
-                "avatar_url": avatar_url
-            }).eq("id", user["id"]).execute()
-        else:
-            # Create new user
-            new_user = {
-                "email": email,
-                "name": name,
-                "avatar_url": avatar_url,
-                "google_id": google_id,
-                "role": "student"
-            }
-            result = supabase.table("users").insert(new_user).execute()
-            user = result.data[0]
+        # Create the user or refresh their profile in one statement. Role is left out
+        # so new users get the column default ('student') and existing admins keep theirs.
+        pool = await get_pool()
+        row = await pool.fetchrow("""
+            INSERT INTO users (email, name, avatar_url, google_id)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (google_id) DO UPDATE
+                SET name = EXCLUDED.name, avatar_url = EXCLUDED.avatar_url
+            RETURNING id, email, name, avatar_url, role, created_at
+        """, email, name, avatar_url, google_id)
+        user = record_to_dict(row)
 
         # Generate JWT token
         access_token = create_jwt_token(user)
 
-        return AuthResponse(
+        # The row comes straight from the database, so skip re-validating it
+        auth_response = AuthResponse.model_construct(
             access_token=access_token,
-            user=UserResponse(
+            user=UserResponse.model_construct(
                 id=user["id"],
                 email=user["email"],
                 name=user["name"],
@@ -184,6 +240,13 @@ async def google_login(request: GoogleLoginRequest):
             )
         )
 
+        # Replays of this ID token skip verification and the database until shortly before it expires
+        ttl = min(LOGIN_CACHE_TTL_SECONDS, idinfo["exp"] - time.time() - 30)
+        if ttl > 0:
+            _login_cache[cache_key] = (user["id"], auth_response, ttl)
+
+        return auth_response
+
     except ValueError as e:
         raise HTTPException(status_code=401, detail=f"Invalid Google token: {str(e)}")
     except Exception as e:
@@ -195,7 +258,7 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     """
     Returns the current authenticated user's information.
     """
-    return UserResponse(
+    return UserResponse.model_construct(
         id=current_user["id"],
         email=current_user["email"],
         name=current_user["name"],
@@ -214,13 +277,47 @@ async def logout():
     return MessageResponse(message="Logged out successfully")
 
 
+async def _promote_to_admin(user_ids: List[str], actor_id: str) -> int:
+    """
+    Sets the admin role on all given users and returns how many rows changed.
+    The acting user's admin role is re-checked in the same statement, since
+    require_admin only trusts the token's claims.
+    """
+    pool = await get_pool()
+    row = await pool.fetchrow("""
+        WITH actor AS (
+            SELECT 1 FROM users WHERE id = $2 AND role = 'admin'
+        ), promoted AS (
+            UPDATE users SET role = 'admin'
+            WHERE id = ANY($1::uuid[]) AND EXISTS (SELECT 1 FROM actor)
+            RETURNING id
+        )
+        SELECT EXISTS (SELECT 1 FROM actor) AS is_admin, (SELECT count(*) FROM promoted) AS promoted
+    """, user_ids, actor_id)
+    
+    if not row["is_admin"]:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    invalidate_user_cache(set(user_ids))
+    return row["promoted"]
+
+
+@router.put("/make-admin", response_model=MessageResponse)
+async def make_admins(request: MakeAdminRequest, admin: dict = Depends(require_admin)):
+    """
+    Promotes several users to admin role in one request. Requires admin access.
+    """
+    if not request.user_ids:
+        raise HTTPException(status_code=400, detail="No users to promote")
+    
+    promoted = await _promote_to_admin(request.user_ids, admin["id"])
+    return MessageResponse(message=f"{promoted} users promoted to admin")
+
+
 @router.put("/make-admin/{user_id}", response_model=MessageResponse)
 async def make_admin(user_id: str, admin: dict = Depends(require_admin)):
     """
     Promotes a user to admin role. Requires admin access.
     """
-    if not supabase:
-        raise HTTPException(status_code=500, detail="Database not configured")
-    
-    supabase.table("users").update({"role": "admin"}).eq("id", user_id).execute()
+    await _promote_to_admin([user_id], admin["id"])
     return MessageResponse(message="User promoted to admin")
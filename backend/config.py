@@ -0,0 +1,52 @@
+"""
+Application Settings
+Environment configuration, read once at import from environment variables and .env files.
+"""
+
+from pathlib import Path
+from typing import List
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+
+class Settings(BaseSettings):
+    """
+    Typed environment configuration. Field names match the variables in .env.example
+    (case-insensitive); a .env in backend/ overrides one in the project root.
+    """
+    model_config = SettingsConfigDict(
+        env_file=(BACKEND_DIR.parent / ".env", BACKEND_DIR / ".env"),
+        extra="ignore",
+        frozen=True
+    )
+
+    # Supabase
+    supabase_url: str = ""
+    supabase_service_key: str = ""
+    supabase_db_url: str = ""
+
+    # Google OAuth & JWT
+    google_client_id: str = ""
+    jwt_secret: str = "your-secret-key-change-in-production"
+
+    # CORS — comma-separated frontend origins; ENV=dev allows any origin
+    allowed_origins: str = "http://localhost:3000,http://localhost:5500,http://127.0.0.1:5500"
+    env: str = ""
+
+    # Redis — optional shared response cache
+    redis_url: str = ""
+
+    # Worker threads for blocking calls (supabase-py queries, Google token verification);
+    # the outbound keep-alive pools are sized from this as well
+    worker_threads: int = 64
+
+    @property
+    def allowed_origins_list(self) -> List[str]:
+        """ALLOWED_ORIGINS split into individual origins."""
+        return self.allowed_origins.split(",")
+
+
+# Singleton settings instance for reuse
+settings = Settings()
@@ -0,0 +1,86 @@
+"""
+Response Cache
+Short-lived caching for public, read-heavy endpoints (club and event listings).
+Uses Redis when REDIS_URL is configured so all workers share one cache,
+otherwise falls back to an in-process TTL cache.
+"""
+
+import functools
+import hashlib
+import json
+
+from cachetools import TTLCache
+from fastapi.encoders import jsonable_encoder
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from backend.config import settings
+
+# Cache configuration
+REDIS_URL: str = settings.redis_url
+CACHE_PREFIX = "college-hub"
+CACHE_TTL_SECONDS = 60
+
+# Shared Redis client (connections are opened lazily on first use)
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
+# In-process fallback, keyed by (namespace, key)
+_local_cache: TTLCache = TTLCache(maxsize=1024, ttl=CACHE_TTL_SECONDS)
+
+
+def _build_key(func, kwargs: dict) -> str:
+    """Builds a stable cache key from the endpoint and its query/path parameters."""
+    raw = f"{func.__module__}:{func.__name__}:{sorted(kwargs.items())!r}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def cached(namespace: str):
+    """
+    Decorator that caches an endpoint's JSON-compatible result for CACHE_TTL_SECONDS.
+    Only use on public endpoints — the key does not include the caller's identity.
+    Apply it below the router decorator so FastAPI still sees the original signature.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = _build_key(func, kwargs)
+
+            if redis_client:
+                redis_key = f"{CACHE_PREFIX}:{namespace}:{key}"
+                try:
+                    hit = await redis_client.get(redis_key)
+                    if hit is not None:
+                        return json.loads(hit)
+                except RedisError:
+                    pass
+            elif (namespace, key) in _local_cache:
+                return _local_cache[(namespace, key)]
+
+            result = jsonable_encoder(await func(**kwargs))
+
+            if redis_client:
+                try:
+                    await redis_client.set(redis_key, json.dumps(result), ex=CACHE_TTL_SECONDS)
+                except RedisError:
+                    pass
+            else:
+                _local_cache[(namespace, key)] = result
+
+            return result
+        return wrapper
+    return decorator
+
+
+async def invalidate(namespace: str) -> None:
+    """Drops every cached response in a namespace (call after writes)."""
+    if redis_client:
+        try:
+            keys = [k async for k in redis_client.scan_iter(match=f"{CACHE_PREFIX}:{namespace}:*")]
+            if keys:
+                await redis_client.delete(*keys)
+        except RedisError:
+            pass
+        return
+
+    for cache_key in [k for k in list(_local_cache.keys()) if k[0] == namespace]:
+        _local_cache.pop(cache_key, None)
@@ -0,0 +1,116 @@
+-- ============================================================
+-- College Event & Club Hub - Upgrade for existing databases
+-- Brings a project created from an older schema.sql up to date.
+-- Safe to run more than once; fresh projects only need schema.sql.
+-- ============================================================
+
+BEGIN;
+
+-- ============================================================
+-- DENORMALIZED COUNTERS
+-- Adds clubs.member_count / events.registration_count, the triggers that
+-- maintain them, and a backfill from the existing rows. Creating the triggers
+-- locks the membership/registration tables until COMMIT, so no change is missed.
+-- ============================================================
+ALTER TABLE clubs ADD COLUMN IF NOT EXISTS member_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE events ADD COLUMN IF NOT EXISTS registration_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION update_club_member_count()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE clubs SET member_count = member_count + 1 WHERE id = NEW.club_id;
+    ELSE
+        UPDATE clubs SET member_count = member_count - 1 WHERE id = OLD.club_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION update_event_registration_count()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE events SET registration_count = registration_count + 1 WHERE id = NEW.event_id;
+    ELSE
+        UPDATE events SET registration_count = registration_count - 1 WHERE id = OLD.event_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS club_memberships_count ON club_memberships;
+CREATE TRIGGER club_memberships_count
+    AFTER INSERT OR DELETE ON club_memberships
+    FOR EACH ROW EXECUTE FUNCTION update_club_member_count();
+
+DROP TRIGGER IF EXISTS event_registrations_count ON event_registrations;
+CREATE TRIGGER event_registrations_count
+    AFTER INSERT OR DELETE ON event_registrations
+    FOR EACH ROW EXECUTE FUNCTION update_event_registration_count();
+
+-- Backfill counters from existing rows
+UPDATE clubs c SET member_count = (
+    SELECT count(*) FROM club_memberships m WHERE m.club_id = c.id
+);
+UPDATE events e SET registration_count = (
+    SELECT count(*) FROM event_registrations r WHERE r.event_id = e.id
+);
+
+-- ============================================================
+-- FUNCTIONS (called from the backend via supabase.rpc)
+-- Needs the counter columns above
+-- ============================================================
+
+-- Registers a user for an event: existence, duplicate and capacity checks plus the insert
+-- run in one transaction. Returns 'ok', 'not_found', 'already_registered' or 'full'.
+-- The event row is locked so concurrent registrations cannot overfill it.
+-- A NULL or 0 max_participants means unlimited.
+DROP FUNCTION IF EXISTS register_if_available(UUID, UUID);
+
+CREATE OR REPLACE FUNCTION register_for_event(p_event_id UUID, p_user_id UUID)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_max_participants INTEGER;
+    v_registration_count INTEGER;
+BEGIN
+    SELECT max_participants, registration_count INTO v_max_participants, v_registration_count
+    FROM events WHERE id = p_event_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN 'not_found';
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM event_registrations WHERE event_id = p_event_id AND user_id = p_user_id
+    ) THEN
+        RETURN 'already_registered';
+    END IF;
+
+    IF v_max_participants > 0 AND v_registration_count >= v_max_participants THEN
+        RETURN 'full';
+    END IF;
+
+    INSERT INTO event_registrations (user_id, event_id) VALUES (p_user_id, p_event_id);
+    RETURN 'ok';
+END;
+$$;
+
+-- ============================================================
+-- SEARCH & ORDERING INDEXES
+-- Trigram indexes so the name/title search filters avoid sequential scans
+-- ============================================================
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_clubs_created_at ON clubs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_clubs_name_trgm ON clubs USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_events_title_trgm ON events USING gin (title gin_trgm_ops);
+
+COMMIT;
@@ -0,0 +1,71 @@
+"""
+Postgres Connection Pool
+Direct asyncpg access to the Supabase Postgres database for hot read paths,
+skipping the PostgREST HTTP layer.
+"""
+
+import asyncio
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+import asyncpg
+from fastapi import HTTPException
+
+from backend.config import settings
+
+# Direct (or session-mode pooler) connection string from Supabase → Settings → Database
+SUPABASE_DB_URL: str = settings.supabase_db_url
+
+if not SUPABASE_DB_URL:
+    print("WARNING: Postgres connection not configured. Set SUPABASE_DB_URL in .env")
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool() -> asyncpg.Pool:
+    """
+    Returns the shared connection pool, creating it on first use.
+    Created lazily because serverless workers do not reliably run startup hooks.
+    """
+    global _pool
+
+    if not SUPABASE_DB_URL:
+        raise HTTPException(status_code=500, detail="Database not configured")
+
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    SUPABASE_DB_URL,
+                    min_size=1,
+                    max_size=10,
+                    command_timeout=10,
+                    statement_cache_size=1024
+                )
+    return _pool
+
+
+async def close_pool() -> None:
+    """Closes the shared pool (called on application shutdown)."""
+    global _pool
+
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def record_to_dict(record: asyncpg.Record) -> dict:
+    """
+    Converts an asyncpg record to the same JSON-friendly shape PostgREST returns:
+    UUIDs as strings and timestamps as ISO 8601 strings.
+    """
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, UUID):
+            value = str(value)
+        elif isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        row[key] = value
+    return row
@@ -5,6 +5,9 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Enable trigram matching (index-assisted ILIKE '%term%' searches)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- ============================================================
 -- USERS TABLE
 -- Stores all authenticated users (students & admins)
@@ -34,6 +37,7 @@ CREATE TABLE IF NOT EXISTS events (
     created_by UUID REFERENCES users(id) ON DELETE SET NULL,
     status VARCHAR(20) DEFAULT 'upcoming' CHECK (status IN ('upcoming', 'ongoing', 'completed', 'cancelled')),
     max_participants INTEGER,
+    registration_count INTEGER NOT NULL DEFAULT 0,  -- maintained by trigger
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -48,6 +52,7 @@ CREATE TABLE IF NOT EXISTS clubs (
     logo_url TEXT,
     category VARCHAR(50),
     created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+    member_count INTEGER NOT NULL DEFAULT 0,  -- maintained by trigger
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -99,10 +104,16 @@ CREATE INDEX IF NOT EXISTS idx_event_registrations_event ON event_registrations(
 CREATE INDEX IF NOT EXISTS idx_club_memberships_user ON club_memberships(user_id);
 CREATE INDEX IF NOT EXISTS idx_club_memberships_club ON club_memberships(club_id);
 CREATE INDEX IF NOT EXISTS idx_club_announcements_club ON club_announcements(club_id);
+CREATE INDEX IF NOT EXISTS idx_clubs_created_at ON clubs(created_at DESC);
+
+-- Trigram indexes so the name/title search filters avoid sequential scans
+CREATE INDEX IF NOT EXISTS idx_clubs_name_trgm ON clubs USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_events_title_trgm ON events USING gin (title gin_trgm_ops);
 
 -- ============================================================
 -- ROW LEVEL SECURITY (RLS) Policies
 -- Enable RLS on all tables for Supabase
+-- Policies are dropped first so this file can be re-run on an existing project
 -- ============================================================
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE events ENABLE ROW LEVEL SECURITY;
@@ -112,17 +123,116 @@ ALTER TABLE club_memberships ENABLE ROW LEVEL SECURITY;
 ALTER TABLE club_announcements ENABLE ROW LEVEL SECURITY;
 
 -- Allow read access to all authenticated users
+DROP POLICY IF EXISTS "Allow read access" ON users;
 CREATE POLICY "Allow read access" ON users FOR SELECT USING (true);
+DROP POLICY IF EXISTS "Allow read access" ON events;
 CREATE POLICY "Allow read access" ON events FOR SELECT USING (true);
+DROP POLICY IF EXISTS "Allow read access" ON clubs;
 CREATE POLICY "Allow read access" ON clubs FOR SELECT USING (true);
+DROP POLICY IF EXISTS "Allow read access" ON event_registrations;
 CREATE POLICY "Allow read access" ON event_registrations FOR SELECT USING (true);
+DROP POLICY IF EXISTS "Allow read access" ON club_memberships;
 CREATE POLICY "Allow read access" ON club_memberships FOR SELECT USING (true);
+DROP POLICY IF EXISTS "Allow read access" ON club_announcements;
 CREATE POLICY "Allow read access" ON club_announcements FOR SELECT USING (true);
 
 -- Allow insert/update/delete via service role (backend handles auth)
+DROP POLICY IF EXISTS "Allow all for service role" ON users;
 CREATE POLICY "Allow all for service role" ON users FOR ALL USING (true);
+DROP POLICY IF EXISTS "Allow all for service role" ON events;
 CREATE POLICY "Allow all for service role" ON events FOR ALL USING (true);
+DROP POLICY IF EXISTS "Allow all for service role" ON clubs;
 CREATE POLICY "Allow all for service role" ON clubs FOR ALL USING (true);
+DROP POLICY IF EXISTS "Allow all for service role" ON event_registrations;
 CREATE POLICY "Allow all for service role" ON event_registrations FOR ALL USING (true);
+DROP POLICY IF EXISTS "Allow all for service role" ON club_memberships;
 CREATE POLICY "Allow all for service role" ON club_memberships FOR ALL USING (true);
+DROP POLICY IF EXISTS "Allow all for service role" ON club_announcements;
 CREATE POLICY "Allow all for service role" ON club_announcements FOR ALL USING (true);
+
+-- ============================================================
+-- DENORMALIZED COUNTERS
+-- clubs.member_count and events.registration_count are kept in sync by
+-- triggers in the same transaction as the membership/registration change,
+-- so listings read a column instead of counting rows.
+-- Existing projects get the columns and a backfill from migrate.sql.
+-- ============================================================
+
+CREATE OR REPLACE FUNCTION update_club_member_count()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE clubs SET member_count = member_count + 1 WHERE id = NEW.club_id;
+    ELSE
+        UPDATE clubs SET member_count = member_count - 1 WHERE id = OLD.club_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION update_event_registration_count()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE events SET registration_count = registration_count + 1 WHERE id = NEW.event_id;
+    ELSE
+        UPDATE events SET registration_count = registration_count - 1 WHERE id = OLD.event_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS club_memberships_count ON club_memberships;
+CREATE TRIGGER club_memberships_count
+    AFTER INSERT OR DELETE ON club_memberships
+    FOR EACH ROW EXECUTE FUNCTION update_club_member_count();
+
+DROP TRIGGER IF EXISTS event_registrations_count ON event_registrations;
+CREATE TRIGGER event_registrations_count
+    AFTER INSERT OR DELETE ON event_registrations
+    FOR EACH ROW EXECUTE FUNCTION update_event_registration_count();
+
+-- ============================================================
+-- FUNCTIONS (called from the backend via supabase.rpc)
+-- ============================================================
+
+-- Registers a user for an event: existence, duplicate and capacity checks plus the insert
+-- run in one transaction. Returns 'ok', 'not_found', 'already_registered' or 'full'.
+-- The event row is locked so concurrent registrations cannot overfill it.
+-- A NULL or 0 max_participants means unlimited.
+DROP FUNCTION IF EXISTS register_if_available(UUID, UUID);
+
+CREATE OR REPLACE FUNCTION register_for_event(p_event_id UUID, p_user_id UUID)
+RETURNS TEXT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_max_participants INTEGER;
+    v_registration_count INTEGER;
+BEGIN
+    SELECT max_participants, registration_count INTO v_max_participants, v_registration_count
+    FROM events WHERE id = p_event_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN 'not_found';
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM event_registrations WHERE event_id = p_event_id AND user_id = p_user_id
+    ) THEN
+        RETURN 'already_registered';
+    END IF;
+
+    IF v_max_participants > 0 AND v_registration_count >= v_max_participants THEN
+        RETURN 'full';
+    END IF;
+
+    INSERT INTO event_registrations (user_id, event_id) VALUES (p_user_id, p_event_id);
+    RETURN 'ok';
+END;
+$$;
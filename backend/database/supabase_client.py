@@ -3,29 +3,56 @@ Supabase Client Configuration
 Initializes and exports the Supabase client for database operations.
 """
 
-import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
+import asyncio
 
-# Load environment variables from .env file
-load_dotenv()
+import httpx
+from supabase import create_client, Client, ClientOptions
+
+from backend.config import settings
 
 # Supabase configuration
-SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
-SUPABASE_KEY: str = os.getenv("SUPABASE_SERVICE_KEY", "")
+SUPABASE_URL: str = settings.supabase_url
+SUPABASE_KEY: str = settings.supabase_service_key
 
 # Validate required environment variables
 if not SUPABASE_URL or not SUPABASE_KEY:
     print("WARNING: Supabase credentials not configured. Set SUPABASE_URL and SUPABASE_SERVICE_KEY in .env")
 
 
+# One HTTP/2 keep-alive connection pool shared by every PostgREST query.
+# One connection per worker thread used by run_query, so bursts never reopen TLS connections.
+http_client = httpx.Client(
+    http2=True,
+    timeout=10,
+    follow_redirects=True,
+    limits=httpx.Limits(
+        max_connections=settings.worker_threads,
+        max_keepalive_connections=settings.worker_threads
+    )
+)
+
+
 def get_supabase_client() -> Client:
     """
     Creates and returns a Supabase client instance.
     Uses service role key for full database access from the backend.
     """
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    return create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(httpx_client=http_client))
 
 
 # Singleton client instance for reuse
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+supabase: Client = get_supabase_client() if SUPABASE_URL and SUPABASE_KEY else None
+
+
+def close_http_client() -> None:
+    """Closes the shared HTTP connection pool (called on application shutdown)."""
+    http_client.close()
+
+
+async def run_query(query):
+    """
+    Executes a Supabase query builder in a worker thread.
+    The client is synchronous, so this keeps the event loop free and lets
+    independent queries overlap via asyncio.gather.
+    """
+    return await asyncio.to_thread(query.execute)
@@ -3,38 +3,49 @@ College Event & Club Hub — FastAPI Backend
 Main application entry point with CORS, router mounting, and health check.
 """
 
-import os
-import sys
-from pathlib import Path
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
-# Ensure the backend directory is in Python's path (required for Vercel deployment)
-BACKEND_DIR = str(Path(__file__).resolve().parent)
-if BACKEND_DIR not in sys.path:
-    sys.path.insert(0, BACKEND_DIR)
-
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from backend.config import settings
 
 # Import routers
-from auth.google_oauth import router as auth_router
-from api.events import router as events_router
-from api.clubs import router as clubs_router
-from api.registrations import router as registrations_router
+from backend.auth.google_oauth import router as auth_router, warm_up as warm_up_auth
+from backend.api.events import router as events_router
+from backend.api.clubs import router as clubs_router
+from backend.api.registrations import router as registrations_router
+from backend.database.pool import close_pool
+from backend.database.supabase_client import close_http_client
 
 # ============================================================
 # App Configuration
 # ============================================================
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan — connection pools are opened on first use and closed on shutdown.
+    Google's signing certificates are fetched up front so the first login is not slowed down.
+    """
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=settings.worker_threads))
+    await asyncio.to_thread(warm_up_auth)
+    yield
+    await close_pool()
+    close_http_client()
+
+
 app = FastAPI(
     title="College Event & Club Hub API",
     description="Backend API for managing college events, clubs, registrations, and authentication.",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # ============================================================
@@ -42,14 +53,18 @@ app = FastAPI(
 # Allow frontend origins for cross-origin requests
 # ============================================================
 
-ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5500,http://127.0.0.1:5500").split(",")
+ALLOWED_ORIGINS = settings.allowed_origins_list
+
+# Allow any origin only when explicitly running in development
+if settings.env == "dev":
+    ALLOWED_ORIGINS = ["*"]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=ALLOWED_ORIGINS + ["*"],  # Allow all origins in development
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
 )
 
 # ============================================================
@@ -67,21 +82,26 @@ app.include_router(registrations_router, prefix="/api")
 # Root & Health Check Endpoints
 # ============================================================
 
+# Constant bodies, encoded once — these endpoints are hit constantly by monitors and load balancers
+_ROOT_BODY = orjson.dumps({
+    "message": "College Event & Club Hub API",
+    "version": "1.0.0",
+    "status": "running",
+    "docs": "/docs"
+})
+_HEALTH_BODY = orjson.dumps({"status": "healthy"})
+
+
 @app.get("/")
 async def root():
     """Root endpoint — API status check."""
-    return {
-        "message": "College Event & Club Hub API",
-        "version": "1.0.0",
-        "status": "running",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring."""
-    return {"status": "healthy"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # ============================================================
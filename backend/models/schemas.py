@@ -3,8 +3,8 @@ Pydantic Models (Schemas)
 Request/response models for all API endpoints.
 """
 
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import Optional, List, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -54,12 +54,11 @@ class UserCreate(UserBase):
 class UserResponse(UserBase):
     """Schema for user response"""
     id: str
-    role: UserRole
+    role: Literal["student", "admin"]
     google_id: Optional[str] = None
     created_at: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
@@ -110,8 +109,8 @@ class EventResponse(EventBase):
     registration_count: Optional[int] = 0
     is_registered: Optional[bool] = False
 
-    class Config:
-        from_attributes = True
+    # Keep raw strings so rows built with model_construct serialize cleanly
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
 # ============================================================
@@ -147,8 +146,7 @@ class ClubResponse(ClubBase):
     member_count: Optional[int] = 0
     is_member: Optional[bool] = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ============================================================
@@ -221,6 +219,16 @@ class MessageResponse(BaseModel):
     success: bool = True
 
 
+class BulkDeleteRequest(BaseModel):
+    """Schema for admin bulk deletes — ids of the rows to remove"""
+    ids: List[str]
+
+
+class MakeAdminRequest(BaseModel):
+    """Schema for promoting several users to admin at once"""
+    user_ids: List[str]
+
+
 class PaginatedResponse(BaseModel):
     """Paginated response wrapper"""
     data: list